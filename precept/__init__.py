@@ -1,14 +1,40 @@
+import importlib
+import typing
+
 from ._version import __version__  # noqa: F401
-from ._cli import Command, Argument  # noqa: F401
-from ._precept import Precept  # noqa: F401
-from ._tools import AutoNameEnum, is_windows  # noqa: F401, F403
-from ._immutable import ImmutableProp, ImmutableDict, ImmutableMeta  # noqa: F401, F403, E501
-from ._configs import (  # noqa: F401
-    ConfigProperty, Config, ConfigFormat, Nestable, config_factory
-)
-from ._executor import AsyncExecutor  # noqa: F401
-from ._services import Service  # noqa: F401
-from ._plugins import Plugin  # noqa: F401
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from ._cli import Command, Argument
+    from ._precept import Precept
+    from ._tools import AutoNameEnum, is_windows
+    from ._immutable import ImmutableProp, ImmutableDict, ImmutableMeta
+    from ._configs import (
+        ConfigProperty, Config, ConfigFormat, Nestable, config_factory
+    )
+    from ._executor import AsyncExecutor
+    from ._services import Service
+    from ._plugins import Plugin
+
+# Public names are resolved on first access (PEP 562) so that importing
+# precept doesn't pull argparse, asyncio and the config backends up front.
+_LAZY = {
+    'Command': '._cli',
+    'Argument': '._cli',
+    'Precept': '._precept',
+    'AutoNameEnum': '._tools',
+    'is_windows': '._tools',
+    'ImmutableProp': '._immutable',
+    'ImmutableDict': '._immutable',
+    'ImmutableMeta': '._immutable',
+    'ConfigProperty': '._configs',
+    'Config': '._configs',
+    'ConfigFormat': '._configs',
+    'Nestable': '._configs',
+    'config_factory': '._configs',
+    'AsyncExecutor': '._executor',
+    'Service': '._services',
+    'Plugin': '._plugins',
+}
 
 
 __all__ = [
@@ -30,3 +56,16 @@ __all__ = [
     'is_windows',
     'AutoNameEnum'
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
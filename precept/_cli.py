@@ -1,23 +1,62 @@
 """Class based cli builder with sub commands."""
+import collections
+import copy
+import io
 import shlex
 import sys
 import argparse
-import asyncio
-import itertools
+import contextvars
 import typing
 import functools
 import inspect
 
-import stringcase
-
-from ._tools import is_windows
+from ._tools import is_windows, snakecase, spinalcase
 from ._services import Service
 from ._immutable import ImmutableDict
 from .events import PreceptEvent
 
 
+_signature = functools.lru_cache(maxsize=256)(inspect.signature)
+_empty = inspect.Parameter.empty
+
+# Namespace key of the handler set by the command sub-parser.
+_HANDLER_KEY = '_handler'
+
+# Number of parsed namespaces kept with cache_parses.
+_PARSED_MAX = 64
+
+
 def _flags_key(flags):
-    return stringcase.snakecase(flags[-1].lstrip('-'))
+    return snakecase(flags[-1].lstrip('-'))
+
+
+# Set while parsing with only some of the commands registered, an unknown
+# command is then raised to check it against all of them before exiting.
+_deferred_errors = contextvars.ContextVar('deferred_errors', default=False)
+
+
+class _DeferredError(Exception):
+    def __init__(self, parser, action, value):
+        super().__init__(value)
+        self.parser = parser
+        self.action = action
+        self.value = value
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    def _check_value(self, action, value):
+        if (_deferred_errors.get()
+                and isinstance(action, argparse._SubParsersAction)
+                and value not in action.choices):
+            raise _DeferredError(self, action, value)
+        super()._check_value(action, value)
+
+
+def _close_files(namespace):
+    for value in vars(namespace).values():
+        if isinstance(value, io.IOBase) and value not in (
+                sys.stdin, sys.stdout, sys.stderr):
+            value.close()
 
 
 class Argument(ImmutableDict):
@@ -30,7 +69,7 @@ class Argument(ImmutableDict):
 
     """
 
-    # pylint: disable=unused-argument, redefined-builtin
+    # pylint: disable=redefined-builtin
     def __init__(
             self,
             *flags: str,
@@ -58,12 +97,23 @@ class Argument(ImmutableDict):
         :param metavar: Name in help.
         :param dest: The name of the variable to add the value to once parsed.
         """
-        super().__init__(**{
-            k: v for k, v in locals().items()
-            if k in self._prop_keys and v is not None
+        options = (
+            ('type', type),
+            ('help', help),
+            ('choices', choices),
+            ('default', default),
+            ('nargs', nargs),
+            ('action', action),
+            ('required', required),
+            ('metavar', metavar),
+            ('dest', dest),
+        )
+        super().__init__(flags=flags, **{
+            k: v for k, v in options if v is not None
         })
 
-    def register(self, parser):
+    @functools.cached_property
+    def _register_payload(self):
         options = {k: v for k, v in self.items() if k != 'flags'}
 
         if 'default' in options and 'help' not in options:
@@ -72,11 +122,15 @@ class Argument(ImmutableDict):
 
         flags = self.flags
         if len(self.flags) == 1 and not self.flags[0].startswith('-'):
-            flags = [stringcase.snakecase(flags[0])]
+            flags = (snakecase(flags[0]),)
 
+        return flags, options
+
+    def register(self, parser):
+        flags, options = self._register_payload
         parser.add_argument(*flags, **options)
 
-    @property
+    @functools.cached_property
     def flag_key(self):
         return _flags_key(self.flags)
 
@@ -117,12 +171,12 @@ class Command:
         self.services = services
 
     def __call__(self, obj):
-        self.obj_name = getattr(obj, '__name__')
+        self.obj_name = obj.__name__
         if not self.command_name:
             self.command_name = self.obj_name
 
         if not self.description:
-            self.description = getattr(obj, '__doc__', '')
+            self.description = obj.__doc__ or ''
 
         if isinstance(obj, type):
 
@@ -134,16 +188,16 @@ class Command:
         else:
             if self.auto:
                 arguments = []
-                signature = inspect.signature(obj)
+                signature = _signature(obj)
                 for k, v in signature.parameters.items():
                     if k in ('self', 'args', 'kwargs'):
                         continue
-                    key = stringcase.spinalcase(k)
+                    key = spinalcase(k)
                     default = None
                     _type = None
                     if v.annotation:
                         _type = v.annotation
-                    if v.default is not v.empty:
+                    if v.default is not _empty:
                         key = f'--{key}'
                         default = v.default
                         if _type is None:  # pragma: no cover
@@ -157,24 +211,53 @@ class Command:
 
         return self._wrapped
 
-    def register(self, subparsers):
+    def register(self, subparsers, handler=None, nested=True):
+        """
+        Add the sub-parser of the command.
+
+        :param subparsers: The sub-parsers action to add the command parser.
+        :param handler: Callable set as the parsed namespace handler,
+            command classes are left to their sub commands.
+        :param nested: Register the sub commands of a command class.
+        :return: The sub-parsers action of a command class, None otherwise.
+        """
         parser = subparsers.add_parser(
-            self.command_name,
-            description=self.description,
-            help=self.help or self.description,
-            formatter_class=CombinedFormatter
+            self.command_name, **self._parser_options
         )
+        subs = None
         if isinstance(self._wrapped, CommandClass):
+            # Command classes are handled by their sub commands, without
+            # one the default command runs.
             subs = parser.add_subparsers(
                 title='Commands', dest='command'
             )
-            # noinspection PyProtectedMember
-            for command_name, command, _ in self._wrapped.get_commands():
-                # get_commands return itself so make sure it's not the same.
-                if command_name != self.command_name:
-                    command.register(subs)
+            if nested:
+                for _, command, wrapper in self.sub_commands:
+                    command.register(subs, wrapper)
+        elif handler is not None:
+            parser.set_defaults(**{_HANDLER_KEY: handler})
         for arg in self.arguments:
             arg.register(parser)
+        return subs
+
+    @functools.cached_property
+    def _parser_options(self):
+        return dict(
+            description=self.description,
+            help=self.help or self.description,
+            formatter_class=CombinedFormatter
+        )
+
+    @property
+    def sub_commands(self):
+        """The (name, command, wrapper) nested in a command class."""
+        if not isinstance(self._wrapped, CommandClass):
+            return ()
+        # get_commands return itself so make sure it's not the same.
+        return tuple(
+            x for x in self._wrapped.get_commands()
+            if x[0] != self.command_name
+        )
 
     @property
     def command_name(self):
@@ -182,10 +265,10 @@ class Command:
 
     @command_name.setter
     def command_name(self, value):
-        self._command_name = stringcase.spinalcase(value) if value else value
+        self._command_name = spinalcase(value) if value else value
 
-    def __hash__(self):  # pragma: no cover
-        return self.command_name
+    def __hash__(self):
+        return hash(self._command_name)
 
 
 class WrappedCommand:
@@ -201,7 +284,12 @@ class WrappedCommand:
 class CommandFunction(WrappedCommand):
     def __init__(self, func, command):
         self.command = command
-        self.func = functools.wraps(self)(func)
+        self.func = func
+        self._attr_name = None
+        functools.update_wrapper(self, func, updated=())
+
+    def __set_name__(self, owner, name):
+        self._attr_name = name
 
     def __call__(self, *args, **kwargs):
         return self.func(*args, **kwargs)
@@ -210,24 +298,35 @@ class CommandFunction(WrappedCommand):
         # Allow to use the self of the class
         if instance is None:
             return self
-        return functools.partial(self.__call__, instance)
+        bound = functools.partial(self.func, instance)
+        namespace = getattr(instance, '__dict__', None)
+        if self._attr_name and namespace is not None:
+            # Shadows the descriptor for the next lookups.
+            namespace[self._attr_name] = bound
+        return bound
 
     def get_commands(self):
         return [(self.command.command_name, self.command, self)]
 
 
 class CommandClass(WrappedCommand):
-    _commands: typing.List[str]
+    _commands: typing.Tuple[str, ...]
+    _command_objs: typing.Tuple[typing.Tuple[str, WrappedCommand], ...]
 
     def __call__(self, command, *args, **kwargs):  # pragma: no cover
         return getattr(self, command)(*args, **kwargs)
 
     def get_commands(self):
+        return self._flat_commands
+
+    @functools.cached_property
+    def _flat_commands(self):
+        # The layout is fixed by the class, only build the wrappers once.
         c = []
-        for command in (getattr(self.__class__, x) for x in self._commands):
-            if issubclass(command.__class__, CommandClass):  # pragma: no cover
+        for _, command in self._command_objs:
+            if isinstance(command, CommandClass):  # pragma: no cover
                 # Recursively get all the commands.
-                c += command.get_commands()
+                c.extend(command.get_commands())
             else:
                 # Get the true one.
                 c.append((
@@ -237,22 +336,23 @@ class CommandClass(WrappedCommand):
                         getattr(self, command.command.obj_name))
                 ))
 
-        # noinspection PyTypeChecker
-        return c + [(self.command.command_name, self.command, self)]
+        c.append((self.command.command_name, self.command, self))
+        return tuple(c)
 
     def clean_arguments(self, func):
+        to_clean = tuple(
+            argument.flag_key for argument in self.command.arguments
+        )
+        to_clean_set = frozenset(to_clean)
 
         @functools.wraps(func)
         def wrap_arguments(*args, **kwargs):
-            to_clean = []
-
-            for argument in self.command.arguments:
-                key = argument.flag_key
-                value = kwargs.get(key)
-                setattr(self, key, value)
-                to_clean.append(key)
+            for key in to_clean:
+                setattr(self, key, kwargs.get(key))
 
-            cleaned = {k: v for k, v in kwargs.items() if k not in to_clean}
+            cleaned = {
+                k: v for k, v in kwargs.items() if k not in to_clean_set
+            }
             return func(*args, **cleaned)
 
         return wrap_arguments
@@ -260,21 +360,29 @@ class CommandClass(WrappedCommand):
 
 class CommandMeta(type):
     def __new__(mcs, name, bases, attributes):
-        new_attributes = dict(**attributes)
-        commands = []
+        # Overridden commands keep their first position.
+        seen = {}
+        for namespace in (*(y.__dict__ for y in bases), attributes):
+            for k, v in namespace.items():
+                if isinstance(v, WrappedCommand):
+                    seen[k] = v
 
-        for k, v in itertools.chain(*(
-                z.items() for z in [y.__dict__ for y in bases] + [attributes]
-        )):
-            if isinstance(v, WrappedCommand):
-                commands.append(k)
+        commands = []
+        for k, v in seen.items():
+            commands.append(k)
             if isinstance(v, CommandClass):
                 # The ast get to nested's first so this can work.
-                commands += v._commands
+                commands.extend(v._commands)
 
-        new_attributes['_commands'] = commands
+        attributes['_commands'] = tuple(commands)
 
-        return type.__new__(mcs, name, bases, new_attributes)
+        cls = type.__new__(mcs, name, bases, attributes)
+        # Resolve the class members once instead of on every instantiation,
+        # nested commands names are not members and are left out.
+        cls._command_objs = tuple(
+            (x, getattr(cls, x)) for x in commands if hasattr(cls, x)
+        )
+        return cls
 
 
 class Cli:
@@ -287,16 +395,25 @@ class Cli:
                  global_arguments=None,
                  default_command=None,
                  events=None,
-                 on_parse=None):
+                 on_parse=None,
+                 cache_parses=False):
+        """
+        :param cache_parses: Reuse the parsed namespace when ``run`` gets
+            the same arguments again, up to the last 64. Parses holding
+            opened files (``argparse.FileType``) are not kept.
+        """
         self.prog = prog
         self.default_command = default_command
-        self.parser = argparse.ArgumentParser(
+        self.parser = _ArgumentParser(
             prog=self.prog,
             description=description,
             formatter_class=formatter_class,
         )
 
         self._global_arguments = global_arguments or []
+        self._global_keys = tuple(
+            _flags_key(g.flags) for g in self._global_arguments
+        )
         self.globals = {}
         self._on_parse = on_parse
         self._events = events
@@ -307,14 +424,137 @@ class Cli:
 
         self.commands = {}
 
-        subparsers = self.parser.add_subparsers(
+        self._subparsers = self.parser.add_subparsers(
             title='Commands', dest='command', metavar=''
         )
 
+        # Sub-parsers are only built for the commands a run asks for,
+        # pending commands are kept by sub-parsers action with the name
+        # of the command they are nested in.
+        pending = {}
+        self._unregistered = {self._subparsers: (None, pending)}
+
         for command_name, command, wrapper in commands:
-            command.register(subparsers)
+            pending[command_name] = (command, wrapper)
             self.commands[command_name] = wrapper
 
+        self._parsed = collections.OrderedDict() if cache_parses else None
+
+    def _parse(self, args):
+        if self._parsed is None:
+            return self._parse_args(args)
+
+        namespace = self._parsed.get(args)
+        if namespace is None:
+            namespace = self._parse_args(args)
+            # Opened files can be closed after a run, parse those again.
+            if not any(
+                    isinstance(value, io.IOBase)
+                    for value in vars(namespace).values()
+            ):
+                self._parsed[args] = namespace
+                if len(self._parsed) > _PARSED_MAX:
+                    self._parsed.popitem(last=False)
+        else:
+            self._parsed.move_to_end(args)
+        # Copy so the handlers can't alter a cached namespace.
+        return argparse.Namespace(**{
+            key: copy.deepcopy(value)
+            if isinstance(value, (list, dict, set)) else value
+            for key, value in vars(namespace).items()
+        })
+
+    def _parse_args(self, args):
+        self._register_commands(args)
+        namespace = argparse.Namespace()
+        token = _deferred_errors.set(bool(self._unregistered))
+        try:
+            return self.parser.parse_args(args=args, namespace=namespace)
+        except _DeferredError as error:
+            deferred = error
+        except SystemExit:
+            _close_files(namespace)
+            raise
+        finally:
+            _deferred_errors.reset(token)
+
+        # Check the unknown command against all of them instead of parsing
+        # again, the files opened by the parse would be opened twice.
+        _close_files(namespace)
+        self._register_commands()
+        try:
+            deferred.parser._check_value(deferred.action, deferred.value)
+        except argparse.ArgumentError as error:
+            deferred.parser.error(str(error))
+        # Only a command missing from the guess gets here.
+        return self.parser.parse_args(args=args)
+
+    def build_parser(self) -> argparse.ArgumentParser:
+        """
+        Register the sub-parsers of every command, nested ones included.
+
+        The sub-parsers are otherwise only built for the commands a run
+        asks for, use this to get the full parser for help or completion.
+
+        :return: The complete parser.
+        """
+        self._register_commands()
+        return self.parser
+
+    def _register_commands(self, args=None):
+        """
+        Register the sub-parsers of the commands found in the arguments.
+
+        Every command gets registered if there are no arguments, none was
+        found or help was asked so the help & errors list them all, same
+        for the sub commands of a selected command class.
+
+        :param args: The raw arguments to be parsed.
+        :return:
+        """
+        if not self._unregistered:
+            return
+
+        names = None
+        if args is not None and not any(
+                arg == '-h' or (len(arg) > 2 and '--help'.startswith(arg))
+                for arg in args
+        ):
+            known = set(self.commands)
+            for _, pending in self._unregistered.values():
+                known.update(pending)
+            names = {arg for arg in args if arg in known} or None
+
+        groups = [
+            subparsers
+            for subparsers, (parent, _) in self._unregistered.items()
+            if names is None or parent is None or parent in names
+        ]
+
+        while groups:
+            subparsers = groups.pop()
+            parent, pending = self._unregistered[subparsers]
+
+            selected = list(pending)
+            if names is not None:
+                selected = [x for x in pending if x in names] or (
+                    selected if parent is not None else []
+                )
+
+            for command_name in selected:
+                command, wrapper = pending.pop(command_name)
+                subs = command.register(subparsers, wrapper, nested=False)
+                if subs is not None:
+                    self._unregistered[subs] = (command_name, {
+                        name: (sub_command, sub_wrapper)
+                        for name, sub_command, sub_wrapper
+                        in command.sub_commands
+                    })
+                    groups.append(subs)
+
+            if not pending:
+                del self._unregistered[subparsers]
+
     async def run(self, args: typing.Union[str, list] = None):
         """
         Parse and call the appropriate handler.
@@ -325,25 +565,32 @@ class Cli:
         if isinstance(args, str):
             args = shlex.split(args, posix=not is_windows())
         self.raw_args = args or sys.argv
-        namespace = self.parser.parse_args(args=args)
-        command = self.commands.get(namespace.command)
-        kw = vars(namespace).copy()
-        kw.pop('command')
-
-        for g in self._global_arguments:
-            key = _flags_key(g.flags)
-            self.globals[key] = kw.pop(key)
+        args = tuple(sys.argv[1:] if args is None else args)
+        namespace = self._parse(args)
+        values = vars(namespace)
+        command = values.get(_HANDLER_KEY)
+        self.globals = {key: values[key] for key in self._global_keys}
+        kw = {
+            k: v for k, v in values.items()
+            if k not in ('command', _HANDLER_KEY) and k not in self.globals
+        }
 
         if callable(self._on_parse):
             await self._on_parse(namespace)
 
         if command:
             operation = command(**kw)
-            event = self._events.dispatch(
-                str(PreceptEvent.CLI_STARTED), command=namespace.command
-            )
-            await asyncio.gather(event, operation)
+            started = str(PreceptEvent.CLI_STARTED)
+            if self._events and self._events.has_listeners(started):
+                import asyncio
+
+                event = self._events.dispatch(
+                    started, command=namespace.command
+                )
+                await asyncio.gather(event, operation)
+            else:
+                await operation
         elif self.default_command:
-            await self.default_command(**vars(namespace))
+            await self.default_command(**values)
         else:  # pragma: no cover
-            self.parser.print_help()
+            self.build_parser().print_help()
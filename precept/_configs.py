@@ -1,7 +1,8 @@
 import abc
 import collections
-import configparser
 import copy
+import functools
+import io
 import itertools
 import json
 import os
@@ -9,32 +10,33 @@ import textwrap
 import typing
 from enum import auto
 
-import stringcase
-import tomlkit
-from ruamel import yaml
-from ruamel.yaml.comments import CommentedMap
-
-from ._tools import AutoNameEnum
+from ._tools import AutoNameEnum, snakecase
 from .errors import ConfigError
 
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from ruamel.yaml.comments import CommentedMap
+
 undefined = object()
 
 
 def get_deep(data, *keys, default=None):
     value = data
-    found = False
-    keys = iter(keys)
-
-    while not found:
-        try:
-            key = next(keys)
-            value = value.get(key, undefined)
-            if value is undefined:  # pragma: no cover
-                return default, False
-        except StopIteration:
-            return value, True
-
-    return value, found  # pragma: no cover
+    for key in keys:
+        value = value.get(key, undefined)
+        if value is undefined:  # pragma: no cover
+            return default, False
+    return value, True
+
+
+def _copy_data(value):
+    # Configs are plain data, only the containers need a copy.
+    if isinstance(value, dict):
+        return {k: _copy_data(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_data(v) for v in value]
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return copy.deepcopy(value)
 
 
 def merge(initial, *to_merge):
@@ -45,12 +47,23 @@ def merge(initial, *to_merge):
     return data
 
 
-def _to_yaml(root: CommentedMap, obj):
+@functools.lru_cache(maxsize=1)
+def _safe_yaml():
+    # ruamel.yaml is only imported when the yaml format is used.
+    from ruamel import yaml
+
+    # Comments are only kept on dump, the safe loader is much faster.
+    return yaml.YAML(typ='safe')
+
+
+def _to_yaml(root: 'CommentedMap', obj):
+    # ruamel.yaml is only imported when the yaml format is used.
+    from ruamel.yaml.comments import CommentedMap
+
     if isinstance(obj, Nestable):
         data = CommentedMap()
-        for i, prop in enumerate(
-                getattr(type(obj), x) for x in getattr(obj, '_props', [])
-        ):
+        # noinspection PyProtectedMember
+        for i, prop in enumerate(obj._prop_descriptors):
             root.insert(
                 i, prop.name, _to_yaml(data, getattr(obj, prop.name)),
                 comment=prop.comment
@@ -70,15 +83,30 @@ def _to_dict(obj):
 
 class BaseConfigSerializer:
 
-    def dump(self, configs, path):  # pragma: no cover
+    def dumps(self, configs) -> str:  # pragma: no cover
         raise NotImplementedError
 
+    def dump(self, configs, path):
+        content = self.dumps(configs)
+        try:
+            with open(path, 'r') as f:
+                if f.read() == content:
+                    return
+        except (OSError, UnicodeDecodeError):
+            # Missing or unreadable, write it.
+            pass
+        with open(path, 'w') as f:
+            f.write(content)
+
     def load(self, path):  # pragma: no cover
         raise NotImplementedError
 
 
 class YamlConfigSerializer(BaseConfigSerializer):
-    def dump(self, configs, path):
+    def dumps(self, configs):
+        from ruamel import yaml
+        from ruamel.yaml.comments import CommentedMap
+
         ya_data: CommentedMap = CommentedMap()
         root_comment = getattr(configs, '__doc__', None)
         if root_comment:
@@ -88,18 +116,18 @@ class YamlConfigSerializer(BaseConfigSerializer):
 
         yml = yaml.YAML()
 
-        with open(path, 'w') as f:
-            yml.dump(ya_data, f)
+        stream = io.StringIO()
+        yml.dump(ya_data, stream)
+        return stream.getvalue()
 
     def load(self, path):
         with open(path, 'r') as f:
-            return yaml.load(f, Loader=yaml.RoundTripLoader)
+            return _safe_yaml().load(f)
 
 
 class JsonConfigSerializer(BaseConfigSerializer):
-    def dump(self, configs, path):
-        with open(path, 'w') as f:
-            json.dump(_to_dict(configs), f)
+    def dumps(self, configs):
+        return json.dumps(_to_dict(configs))
 
     def load(self, path):  # pragma: no cover
         with open(path, 'r') as f:
@@ -110,7 +138,9 @@ class IniConfigSerializer(BaseConfigSerializer):
     def __init__(self, root_name):
         self.root_name = root_name
 
-    def dump(self, configs, path):
+    def dumps(self, configs):
+        import configparser
+
         cfg = configparser.ConfigParser(allow_no_value=True)
         leftovers = []
 
@@ -142,14 +172,19 @@ class IniConfigSerializer(BaseConfigSerializer):
                 leftovers = []
 
             if isinstance(value, list):
+                from ruamel import yaml
+
                 cfg[top][prop.name] = yaml.round_trip_dump(value)
             else:
                 cfg[top][prop.name] = str(value)
 
-        with open(path, 'w') as f:
-            cfg.write(f)
+        stream = io.StringIO()
+        cfg.write(stream)
+        return stream.getvalue()
 
     def load(self, path):
+        import configparser
+
         cfg = configparser.ConfigParser()
         with open(path) as f:
             cfg.read_file(f)
@@ -172,7 +207,9 @@ class IniConfigSerializer(BaseConfigSerializer):
 
 class TomlConfigSerializer(BaseConfigSerializer):
 
-    def dump(self, configs, path):
+    def dumps(self, configs):
+        import tomlkit
+
         doc = tomlkit.document()
         root_comment = getattr(configs, '__doc__', '')
 
@@ -227,14 +264,40 @@ class TomlConfigSerializer(BaseConfigSerializer):
                 else:
                     add_value(section, key, value)
 
-        with open(path, 'w') as file:
-            file.write(tomlkit.dumps(doc))
+        return tomlkit.dumps(doc)
 
     def load(self, path):
+        import tomlkit
+
         with open(path) as file:
             return dict(tomlkit.parse(file.read()))
 
 
+# Parsed config files by (serializer, path), invalidated when the file changes
+# and the least recently read are dropped past the max size.
+_loaded_files = collections.OrderedDict()
+_loaded_files_max = 32
+
+
+def _load_file(serializer: BaseConfigSerializer, path: str):
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = (
+        type(serializer),
+        getattr(serializer, 'root_name', None),
+        os.path.realpath(path),
+    )
+    cached = _loaded_files.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = stamp, serializer.load(path)
+        _loaded_files[key] = cached
+        if len(_loaded_files) > _loaded_files_max:
+            _loaded_files.popitem(last=False)
+    _loaded_files.move_to_end(key)
+    # The values end up in the config data where they can be mutated.
+    return _copy_data(cached[1])
+
+
 class ConfigFormat(AutoNameEnum):
     """
     Available formats to use with configs.
@@ -261,7 +324,33 @@ class ConfigFormat(AutoNameEnum):
         raise ConfigError('Invalid config format')  # pragma: no cover
 
 
+def _to_list(value):
+    if not isinstance(value, str):
+        return list(value)
+    # Lists from the environ or ini files, json arrays are also valid yaml.
+    try:
+        loaded = json.loads(value)
+        if isinstance(loaded, list):
+            return loaded
+    except ValueError:
+        pass
+    return _safe_yaml().load(value)
+
+
 class ConfigProperty:
+    __slots__ = (
+        'default',
+        'comment',
+        'name',
+        'qualified_name',
+        'config_type',
+        'environ_name',
+        'auto_environ',
+        'auto_global',
+        'global_name',
+        '_coerce',
+    )
+
     def __init__(
             self,
             default=None,
@@ -278,6 +367,9 @@ class ConfigProperty:
         self.name = name
         self.qualified_name = None
         self.config_type = config_type or (type(default) if default else None)
+        self._coerce = self.config_type
+        if self.config_type == list:
+            self._coerce = _to_list
         self.environ_name = environ_name
         self.auto_environ = auto_environ
         self.auto_global = auto_global
@@ -302,14 +394,14 @@ class ConfigProperty:
 
         value = undefined
 
-        app = getattr(instance, '_app', None)
-
-        if self.auto_global and app is not None:
-            value = app.cli.globals.get(self.qualified_name, undefined)
+        if self.auto_global:
+            app = getattr(instance, '_app', None)
+            if app is not None:
+                value = app.cli.globals.get(self.qualified_name, undefined)
 
-            # Only take the value if it's not the default.
-            if value is not undefined and value == self.default:
-                value = undefined
+                # Only take the value if it's not the default.
+                if value is not undefined and value == self.default:
+                    value = undefined
 
         if self.environ_name and value is undefined:
             # pylint: disable=invalid-envvar-default
@@ -324,13 +416,9 @@ class ConfigProperty:
                 if not found:  # pragma: no cover
                     value = self.default
 
-        if value is not None and self.config_type is not None:
+        if value is not None and self._coerce is not None:
             try:
-                if isinstance(value, str) and self.config_type == list:
-                    value = yaml.round_trip_load(value)
-                else:
-                    # pylint: disable=not-callable
-                    value = self.config_type(value)
+                value = self._coerce(value)
             except TypeError as err:
                 raise ConfigError(
                     f'Expected type {repr(self.config_type)} for {value}'
@@ -358,15 +446,15 @@ class ConfigProperty:
 class ConfigMeta(abc.ABCMeta):
     # pylint: disable=arguments-differ
     def __new__(mcs, name, bases, attributes):
-        _new = attributes.copy()
         _props = list(itertools.chain(*(
-            getattr(b, '_props', []) for b in bases
+            getattr(b, '_props', ()) for b in bases
         )))
         _children = list(itertools.chain(*(
-            getattr(b, '_children', []) for b in bases
+            getattr(b, '_children', ()) for b in bases
         )))
 
-        for k, v in attributes.items():
+        # Nested descriptors are added to the namespace while iterating.
+        for k, v in list(attributes.items()):
             if isinstance(v, ConfigProperty):
                 _props.append(k)
             elif isinstance(v, type) and hasattr(v, '_props'):
@@ -375,30 +463,48 @@ class ConfigMeta(abc.ABCMeta):
                 # to loop over the attributes of the class and do it
                 # recursively. So it needs to be a Nestable otherwise
                 # the descriptor will trow because no get_root.
-                _key = stringcase.snakecase(k)
+                _key = snakecase(k)
                 setattr(v, '_key', _key)
-                _new[_key] = _NestableDescriptor(
+                attributes[_key] = _NestableDescriptor(
                     f'_{_key}', getattr(v, '_props'), v, comment=v.__doc__
                 )
                 _children.append(v)
                 _props.append(_key)
 
-        _new['_children'] = _children
-        _new['_props'] = _props
+        attributes['_children'] = tuple(_children)
+        attributes['_props'] = tuple(_props)
+        attributes['_children_keys'] = frozenset(
+            getattr(x, '_key') for x in _children
+        )
 
         # pylint: disable=too-many-function-args
-        return abc.ABCMeta.__new__(mcs, name, bases, _new)
+        cls = abc.ABCMeta.__new__(mcs, name, bases, attributes)
+        cls._prop_descriptors = tuple(getattr(cls, x) for x in _props)
+        return cls
 
 
 class Nestable(collections.abc.Mapping, metaclass=ConfigMeta):
     _parent: typing.Any
     _key: str
-    _children = []
-    _props = []
+    _children = ()
+    _props = ()
+    _children_keys = frozenset()
+    _prop_descriptors = ()
 
     def __init__(self, parent=None, parent_len=0):
         self._parent = parent
         self._parent_len = parent_len
+
+        # The root and the keys leading to this nestable, the parents are
+        # fixed so it is only resolved once.
+        key = getattr(self, '_key', None)
+        if parent is None:
+            self._root_levels = self, (key,) if key is not None else ()
+        else:
+            # noinspection PyProtectedMember
+            root, levels = parent._root_levels
+            self._root_levels = root, levels + (key,)
+
         for child_cls in self._children:
             # noinspection PyProtectedMember
             var_name = child_cls._key
@@ -409,18 +515,12 @@ class Nestable(collections.abc.Mapping, metaclass=ConfigMeta):
             )
 
     def get_root(self, current=None):
-        parent = self._parent
-        if parent is None:
+        if self._parent is None:
             return self
-        levels = [current, self._key] if current else [self._key]
-        last_parent = parent
-        while parent is not None:
-            key = getattr(parent, '_key', None)
-            if key is not None:
-                levels.append(key)
-            last_parent = parent
-            parent = getattr(parent, '_parent', None)
-        return last_parent, reversed(levels)
+        root, levels = self._root_levels
+        if current:
+            return root, levels + (current,)
+        return root, levels
 
     def __getitem__(self, k):
         # Just go into descriptor.
@@ -437,19 +537,20 @@ class Nestable(collections.abc.Mapping, metaclass=ConfigMeta):
             yield prop
 
     def get_prop_paths(self, parent=''):
-        children = [getattr(x, '_key') for x in self._children]
+        children = self._children_keys
         if not parent and hasattr(self, '_key'):  # pragma: no cover
             parent = self._key
-        for prop in (getattr(type(self), x) for x in self._props):
+        prefix = f'{parent}.' if parent else ''
+        for prop in self._prop_descriptors:
             value = getattr(self, prop.name)
-            path = f'{parent + "." if parent else ""}{prop.name}'
+            path = prefix + prop.name
             yield path, value, prop
             if prop.name in children:
-                for k, v, p in value.get_prop_paths(path):
-                    yield k, v, p
+                yield from value.get_prop_paths(path)
 
 
 class _NestableDescriptor(ConfigProperty):
+    __slots__ = ('nestable', 'nested_cls')
 
     def __init__(self, nestable, props, nested_cls, comment=None):
         default = {
@@ -494,7 +595,7 @@ class Config(Nestable):
         if isinstance(prop, _NestableDescriptor):
             data = self._data.get(k, undefined)
             if data is undefined:
-                data = copy.deepcopy(prop.default)
+                data = _copy_data(prop.default)
                 self._data[k] = data
             return data
         return self._data.get(k, prop.default)
@@ -503,7 +604,7 @@ class Config(Nestable):
         self._data = merge(self._data, data)
 
     def read_file(self, path: str):
-        data = self._serializer.load(path)
+        data = _load_file(self._serializer, path)
         updated = {}
 
         def handle_prop(key, value, default, to_update, original):
@@ -541,6 +642,11 @@ class Config(Nestable):
     def save(self, path: str):
         self._serializer.dump(self, path)
 
+    @staticmethod
+    def clear_file_cache():
+        """Clear the parsed files kept by ``read_file``."""
+        _loaded_files.clear()
+
     @property
     def config_format(self) -> ConfigFormat:
         return self._config_format
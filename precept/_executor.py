@@ -1,25 +1,84 @@
 import asyncio
 import functools
+import itertools
+import warnings
 from concurrent.futures import ThreadPoolExecutor
 
 
+def get_event_loop():
+    """
+    Get the running loop or the current loop of the thread, setting a new
+    one if there is none, without relying on the deprecated implicit
+    creation of ``asyncio.get_event_loop``.
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        try:
+            loop = asyncio.get_event_loop()
+            if not loop.is_closed():
+                return loop
+        except RuntimeError:
+            pass
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+def _apply_chunk(func, chunk):
+    return [func(*args) for args in chunk]
+
+
 class AsyncExecutor:
     """Execute functions in a Pool Executor"""
     def __init__(self, loop=None, executor=None, max_workers=None):
         """
-        :param loop: asyncio event loop.
+        :param loop: asyncio event loop, default to the running loop or
+            the current loop of the thread when first accessed.
         :param executor: Set to use an already existing PoolExecutor, default
             to a new ThreadPoolExecutor if not supplied.
         :param max_workers: Max workers of the created ThreadPoolExecutor.
         """
-        self.loop = loop or asyncio.get_event_loop()
-        self.lock = asyncio.Lock()
-        if executor:  # pragma: no cover
-            self.executor = executor
-        else:
+        self._loop = loop
+        self._lock = None
+        self._executor = executor
+        self._max_workers = max_workers
+
+    @property
+    def loop(self):
+        """The event loop, resolved on first access if not supplied."""
+        if self._loop is None:
+            self._loop = get_event_loop()
+        return self._loop
+
+    @loop.setter
+    def loop(self, value):
+        self._loop = value
+
+    @property
+    def lock(self):
+        """Lock of execute_with_lock, created inside the running loop."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    @property
+    def executor(self):
+        """The pool executor, created on first use if not supplied."""
+        if self._executor is None:
             # FIXME Investigate need to call shutdown on executor.
             # pylint: disable=consider-using-with
-            self.executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers
+            )
+        return self._executor
+
+    @executor.setter
+    def executor(self, value):
+        self._executor = value
 
     async def execute(self, func, *args, **kwargs):
         """
@@ -30,12 +89,35 @@ class AsyncExecutor:
         :param kwargs: Keyword arguments to give to the function
         :return:
         """
-        return await self.loop.run_in_executor(
-            self.executor,
-            functools.partial(func, *args, **kwargs)
-        )
+        loop = self._loop or asyncio.get_running_loop()
+        if kwargs:
+            return await loop.run_in_executor(
+                self.executor,
+                functools.partial(func, *args, **kwargs)
+            )
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def execute_many(self, func, args_list, chunksize=16):
+        """
+        Execute a sync function for every arguments of a list, the calls
+        are submitted to the executor in chunks.
 
-    async def execute_with_lock(self, func, *args, **kwargs):  # pragma: no cover # noqa: E501
+        :param func: Synchronous function, must be picklable for a
+            process pool.
+        :param args_list: Iterable of positional arguments tuples.
+        :param chunksize: Number of calls to submit together.
+        :return: The results in the order of the arguments.
+        """
+        if chunksize < 1:
+            raise ValueError(f'chunksize must be at least 1, got {chunksize}')
+        items = list(args_list)
+        chunks = await asyncio.gather(*(
+            self.execute(_apply_chunk, func, items[i:i + chunksize])
+            for i in range(0, len(items), chunksize)
+        ))
+        return list(itertools.chain.from_iterable(chunks))
+
+    async def execute_with_lock(self, func, *args, **kwargs):
         """
         Acquire lock before executing the function.
 
@@ -44,10 +126,8 @@ class AsyncExecutor:
         :param kwargs:
         :return:
         """
-        await self.lock.acquire()
-        ret = await self.execute(func, *args, **kwargs)
-        self.lock.release()
-        return ret
+        async with self.lock:
+            return await self.execute(func, *args, **kwargs)
 
     def wraps(self, func):
         """
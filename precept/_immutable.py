@@ -40,13 +40,15 @@ class ImmutableMeta(abc.ABCMeta):
 
         new_attributes['_prop_keys'] = arguments
 
-        return super().__new__(mcs, name, bases, new_attributes)
+        cls = super().__new__(mcs, name, bases, new_attributes)
+        # Checked on every attribute access of the instances.
+        cls._class_attrs = frozenset(dir(cls))
+        return cls
 
 
 class ImmutableDict(collections.abc.Mapping, metaclass=ImmutableMeta):
     def __init__(self, **kwargs):
         self._initialized = False
-        self._class_attrs = dir(self.__class__)
         self._data = kwargs
         self._initialized = True
 
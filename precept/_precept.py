@@ -6,29 +6,24 @@ import logging
 import os
 import sys
 import typing
-
-import colorama
-import stringcase
-import pkg_resources
+from importlib import metadata
 
 from ._services import Service
 from .events import EventDispatcher, PreceptEvent
 from ._configs import Config, config_factory
-from ._tools import is_windows
+from ._tools import is_windows, snakecase, spinalcase
 from ._cli import CombinedFormatter, Cli, Argument, Command
-from ._executor import AsyncExecutor
-from ._logger import setup_logger
+from ._executor import AsyncExecutor, get_event_loop
 
 from ._cli import CommandMeta
 
 
 class PreceptMeta(CommandMeta):
     def __new__(mcs, name, bases, attributes):
-        new_attributes = dict(**attributes)
         prog_name = attributes.get('_prog_name')
-        new_attributes['_prog_name'] = prog_name or stringcase.spinalcase(name)
+        attributes['_prog_name'] = prog_name or spinalcase(name)
         # pylint: disable=too-many-function-args
-        return CommandMeta.__new__(mcs, name, bases, new_attributes)
+        return CommandMeta.__new__(mcs, name, bases, attributes)
 
 
 class Precept(metaclass=PreceptMeta):
@@ -41,7 +36,8 @@ class Precept(metaclass=PreceptMeta):
 
     Override `main` method for root handler, it gets all the `global_arguments`
     """
-    _commands = []
+    _commands = ()
+    _command_objs = ()
     prog_name = ''
     global_arguments = []
     default_configs: dict = {}
@@ -66,6 +62,7 @@ class Precept(metaclass=PreceptMeta):
             logger_style='%',
             services: typing.List[Service] = None,
             print_version: bool = True,
+            cache_parses: bool = False,
     ):
         """
         :param config_file: Path to the default config file to use. Can be
@@ -83,8 +80,10 @@ class Precept(metaclass=PreceptMeta):
         :param logger_style: The symbol to use for formatting.
         :param services: List of global services to start with the program.
         :param print_version: Print the version & name of the app before start.
+        :param cache_parses: Reuse the parsed arguments when the cli runs
+            again with the same arguments.
         """
-        self.prog_name = self.prog_name or stringcase.spinalcase(
+        self.prog_name = self.prog_name or spinalcase(
             self.__class__.__name__
         )
         self._config_file = config_file
@@ -92,27 +91,28 @@ class Precept(metaclass=PreceptMeta):
                 and isinstance(config_file, str):
             self._config_file = [config_file]
         self._user_configs = None
+        self._resolved_config = None
         self.services = services or []
         self._command = None
         self._args = {}
         self.print_version = print_version
 
         if is_windows():  # pragma: no cover
+            import colorama
             colorama.init()
 
-        self.logger = setup_logger(
-            self.prog_name,
-            logger_level,
-            logger_fmt,
-            logger_datefmt,
-            logger_stream,
-            logger_colors,
-            style=logger_style
+        self._logger_options = dict(
+            level=logger_level,
+            fmt=logger_fmt,
+            datefmt=logger_datefmt,
+            stream=logger_stream,
+            colors=logger_colors,
+            style=logger_style,
         )
+        self.loop = loop or get_event_loop()
         self.executor = AsyncExecutor(
-            loop, executor, max_workers=executor_max_workers
+            self.loop, executor, max_workers=executor_max_workers
         )
-        self.loop = self.executor.loop
         self.events = EventDispatcher()
         self.plugins = {}
 
@@ -144,7 +144,7 @@ class Precept(metaclass=PreceptMeta):
         # Insert global arguments from config
         for _, _, prop in self.config.get_prop_paths():
             if prop.auto_global:
-                key = f'--{stringcase.spinalcase(prop.global_name)}'
+                key = f'--{spinalcase(prop.global_name)}'
 
                 options = dict(
                     default=prop.default,
@@ -162,12 +162,12 @@ class Precept(metaclass=PreceptMeta):
                 common_g_arguments.append(Argument(key, **options))
 
         # Gather commands
-        attributes = dir(self)
+        cls = self.__class__
         commands = list(
             itertools.chain(*(
                 # Don't go into descriptors yet, class members gets the
-                getattr(self.__class__, x).get_commands()
-                for x in self._commands if x in attributes
+                command.get_commands()
+                for _, command in self._command_objs
             ))
         )
 
@@ -200,7 +200,7 @@ class Precept(metaclass=PreceptMeta):
                     x[1],
                     # Now go into the descriptors for that self argument.
                     getattr(self, x[1].obj_name)
-                    if x[1].obj_name in attributes else x[2]
+                    if hasattr(cls, x[1].obj_name) else x[2]
                 ) for x in commands
             ],
             prog=self.prog_name,
@@ -209,7 +209,8 @@ class Precept(metaclass=PreceptMeta):
             on_parse=self._on_parse,
             default_command=self.main,
             formatter_class=help_formatter,
-            events=self.events
+            events=self.events,
+            cache_parses=cache_parses,
         )
 
         setattr(self.config, '_app', self)
@@ -219,14 +220,21 @@ class Precept(metaclass=PreceptMeta):
         else:
             self.loop.create_task(self.setup_plugins())
 
+    @functools.cached_property
+    def logger(self) -> logging.Logger:
+        """The application logger, setup on first use."""
+        from ._logger import setup_logger
+        return setup_logger(self.prog_name, **self._logger_options)
+
     @property
     def config_path(self):
         if self._user_configs:
             return self._user_configs
-        for config in self._config_file:
-            if os.path.exists(config):
-                return config
-        return ''
+        if self._resolved_config is None:
+            self._resolved_config = next(
+                (x for x in self._config_file if os.path.exists(x)), ''
+            )
+        return self._resolved_config
 
     def start(self, args=None):
         """
@@ -336,9 +344,14 @@ class Precept(metaclass=PreceptMeta):
 
         :return:
         """
-        for plugin in pkg_resources.iter_entry_points(
-                f'{stringcase.snakecase(self.prog_name)}.plugins'
-        ):
+        group = f'{snakecase(self.prog_name)}.plugins'
+        try:
+            entry_points = metadata.entry_points(group=group)
+        except TypeError:  # pragma: no cover
+            # Python < 3.10 returns a dict of groups.
+            entry_points = metadata.entry_points().get(group, [])
+
+        for plugin in entry_points:
             plug = plugin.load()
             await plug.setup(self)
             self.plugins[plugin.name] = plug
@@ -352,7 +365,7 @@ class Precept(metaclass=PreceptMeta):
         :return:
         """
         self.logger.error('Please enter a command')
-        self.cli.parser.print_help()
+        self.cli.build_parser().print_help()
 
     async def _on_parse(self, args):
         if args.verbose:
@@ -365,6 +378,8 @@ class Precept(metaclass=PreceptMeta):
             self.logger.setLevel(logging.ERROR)
 
         if self._config_file:
+            # Look for the config file once per run.
+            self._resolved_config = None
             if args.config_file:
                 self._user_configs = args.config_file
 
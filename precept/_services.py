@@ -1,7 +1,7 @@
 import functools
-import stringcase
 
 from .events import EventDispatcher
+from ._tools import snakecase
 
 
 def _dispatch_wrap(func, event, running):
@@ -18,20 +18,19 @@ def _dispatch_wrap(func, event, running):
 
 class ServiceMeta(type):
     def __new__(mcs, name, bases, attributes):
-        _new = dict(**attributes)
-        _name = attributes.get('name') or stringcase.snakecase(name)
-        _new['name'] = _name
+        _name = attributes.get('name') or snakecase(name)
+        attributes['name'] = _name
 
         for _method, _running in (
                 ('setup', False), ('start', True), ('stop', False)
         ):
             _func = attributes.get(_method)
             if _func:
-                _new[_method] = _dispatch_wrap(
+                attributes[_method] = _dispatch_wrap(
                     _func, f'{_name}_{_method}', _running
                 )
 
-        return type.__new__(mcs, name, bases, _new)
+        return type.__new__(mcs, name, bases, attributes)
 
 
 class Service(metaclass=ServiceMeta):
@@ -1,3 +1,4 @@
+import functools
 import sys
 from enum import Enum
 
@@ -7,10 +8,42 @@ __all__ = [
 ]
 
 
+@functools.lru_cache(maxsize=1)
 def is_windows():
     return sys.platform == 'win32'
 
 
+@functools.lru_cache(maxsize=None)
+def snakecase(value: str) -> str:
+    """
+    Convert ``CamelCase``, ``spinal-case`` or dotted names to ``snake_case``.
+
+    Only ascii uppercase letters after the first character get an
+    underscore, ``-``, ``.`` and whitespaces are replaced by one.
+
+    Results are interned, they are used as namespace and config keys.
+    """
+    if not value:
+        return value
+    chars = []
+    for i, char in enumerate(value):
+        if char in '-.' or char.isspace():
+            char = '_'
+        elif not i:
+            char = char.lower()
+        elif 'A' <= char <= 'Z':
+            chars.append('_')
+            char = char.lower()
+        chars.append(char)
+    return sys.intern(''.join(chars))
+
+
+@functools.lru_cache(maxsize=None)
+def spinalcase(value: str) -> str:
+    """Convert a name to ``spinal-case``, see ``snakecase``."""
+    return sys.intern(snakecase(value).replace('_', '-'))
+
+
 class AutoNameEnum(Enum):
     # noinspection PyMethodParameters
     # pylint: disable=no-self-argument, unused-argument, no-member
@@ -5,6 +5,7 @@ import threading
 from itertools import chain
 
 from precept._tools import is_windows
+from precept._executor import get_event_loop
 
 
 class Key:  # pragma: no cover
@@ -122,6 +123,9 @@ class GetChar:
 getch = GetChar()
 
 
+_stop = object()
+
+
 class KeyHandler:  # pragma: no cover
     def __init__(self, handlers, loop=None, default_handler=None):  # pragma: no cover # noqa: E501
         self.handlers = handlers
@@ -129,36 +133,40 @@ class KeyHandler:  # pragma: no cover
             Keys.CTRL_C: lambda _, stop: stop(),
         })
         self.default_handler = default_handler
-        self.loop = loop or asyncio.get_event_loop()
-        self.queue = asyncio.Queue(loop=self.loop)
-        self.stop_event = asyncio.Event(loop=self.loop)
+        self.loop = loop or get_event_loop()
+        # Created on enter, inside the loop they are used with.
+        self.queue = None
+        self.stop_event = None
         self._consumer = None
         self._producer = None
 
     def stop(self):  # pragma: no cover
+        if self.stop_event is None:
+            return
         self.stop_event.set()
+        # Wake up handle waiting on the queue.
+        self.queue.put_nowait(_stop)
 
     def read(self):  # pragma: no cover
         # Make non-blocking.
         while not self.stop_event.is_set():
             char = getch()
-            asyncio.ensure_future(self.queue.put(char), loop=self.loop)
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, char)
 
     async def handle(self):  # pragma: no cover
         while not self.stop_event.is_set():
-            await asyncio.sleep(0.00001)
-            try:
-                msg = self.queue.get_nowait()
-            except asyncio.QueueEmpty:
-                pass
-            else:
-                handler = self.handlers.get(msg)
-                if handler:
-                    handler(msg, self.stop)
-                elif self.default_handler:
-                    self.default_handler(msg, self.stop)
+            msg = await self.queue.get()
+            if msg is _stop or self.stop_event.is_set():
+                break
+            handler = self.handlers.get(msg)
+            if handler:
+                handler(msg, self.stop)
+            elif self.default_handler:
+                self.default_handler(msg, self.stop)
 
     async def __aenter__(self):  # pragma: no cover
+        self.queue = asyncio.Queue()
+        self.stop_event = asyncio.Event()
         self._producer = threading.Thread(target=self.read)
         self._producer.daemon = True
         self._producer.start()
@@ -18,6 +18,15 @@ class EventDispatcher:
         """
         self._subscribers[event].append(func)
 
+    def has_listeners(self, event: str) -> bool:
+        """
+        Check if any function is subscribed to the event.
+
+        :param event: Name of the event.
+        :return:
+        """
+        return bool(self._subscribers.get(event))
+
     async def dispatch(self, event: str, **payload):
         """
         Dispatch an event with optional payload data.
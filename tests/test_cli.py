@@ -1,10 +1,14 @@
+import argparse
+import gc
 import os
 import sys
+import warnings
 
 import pytest
 
 from precept import Precept, Command, Argument
-from precept.events import PreceptEvent
+from precept._cli import Cli
+from precept.events import EventDispatcher, PreceptEvent
 
 
 class SimpleCli(Precept):
@@ -198,8 +202,10 @@ def test_events():
             commands.append(event.payload.command)
 
     cli = SimpleCli()
+    assert not cli.events.has_listeners(str(PreceptEvent.CLI_STARTED))
     for pre_event in PreceptEvent:
         cli.events.subscribe(pre_event, on_event)
+    assert cli.events.has_listeners(str(PreceptEvent.CLI_STARTED))
 
     cli.start('simple 3')
 
@@ -208,3 +214,171 @@ def test_events():
 
     for act in PreceptEvent:
         assert act in events
+
+
+def test_lazy_sub_parsers():
+    cli = SimpleCli()
+    subparsers = cli.cli._subparsers
+
+    cli.start('--quiet simple 1')
+    assert list(subparsers.choices) == ['simple']
+
+    cli.start('--quiet nested --nested=foo nest bar')
+    assert cli.Nested.nest_much == 'foo-bar'
+    assert 'autoarg' not in subparsers.choices
+    nested = subparsers.choices['nested']._subparsers._group_actions[0]
+    assert list(nested.choices) == ['nest']
+
+    cli.start('--quiet nested plain')
+    assert cli.Nested.plain_result == 'plain foo'
+    assert list(nested.choices) == ['nest', 'plain']
+
+    cli.start('--quiet')
+    assert len(subparsers.choices) == len(cli.cli.commands)
+
+
+@pytest.mark.parametrize('args', [
+    '--universal simple -h',
+    '--universal simple --he',
+    '--universal simple invalid',
+])
+def test_lazy_sub_parsers_all_listed(args, capsys):
+    cli = SimpleCli()
+
+    with pytest.raises(SystemExit):
+        cli.start(args)
+
+    captured = capsys.readouterr()
+    output = captured.out + captured.err
+    for command in ('simple', 'log-result', 'nested', 'autoarg'):
+        assert command in output
+    assert output.count('usage:') == 1
+
+
+def test_invalid_command_closes_files(tmp_path, capsys):
+    cli = SimpleCli()
+    log_file = tmp_path / 'log.txt'
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        with pytest.raises(SystemExit):
+            cli.cli._parse(
+                ['--log-file', str(log_file), '--universal', 'simple', 'bad']
+            )
+        gc.collect()
+
+    assert not [x for x in caught if issubclass(x.category, ResourceWarning)]
+    assert 'nested' in capsys.readouterr().err
+
+
+def test_build_parser():
+    cli = SimpleCli()
+    subparsers = cli.cli._subparsers
+    assert not subparsers.choices
+
+    assert cli.cli.build_parser() is cli.cli.parser
+    assert len(subparsers.choices) == len(cli.cli.commands)
+    nested = subparsers.choices['nested']._subparsers._group_actions[0]
+    assert list(nested.choices) == ['nest', 'plain']
+
+
+def test_nested_without_sub_command():
+    cli = SimpleCli()
+    cli.start('--quiet --universal foo nested')
+    assert cli.result == 'foo'
+
+
+def test_command_hash():
+    simple = SimpleCli.simple.command
+    commands = {simple, SimpleCli.autoarg.command}
+
+    assert isinstance(hash(simple), int)
+    assert simple in commands
+
+
+def test_command_function_wraps():
+    assert SimpleCli.simple.__name__ == 'simple'
+    assert SimpleCli.simple.__doc__ == 'Help from docstring'
+    assert SimpleCli.simple.func.__doc__ == 'Help from docstring'
+
+
+def test_commands_override():
+    class OverrideCli(SimpleCli):
+        @Command(
+            Argument('foo', type=int),
+            Argument('--bar', default=2, type=int),
+        )
+        async def simple(self, foo, bar):
+            self.result = foo * bar
+
+    assert OverrideCli._commands.count('simple') == 1
+
+    cli = OverrideCli()
+    cli.start('--quiet simple 4')
+    assert cli.result == 8
+
+
+def test_command_function_bound_once():
+    cli = SimpleCli()
+    bound = cli.simple
+    assert cli.simple is bound
+    assert cli.simple.func is SimpleCli.simple.func
+
+
+@pytest.mark.async_test
+async def test_cli_cache_parses(tmp_path, monkeypatch):
+    results = []
+
+    @Command(Argument('value', type=int))
+    async def add(value):
+        results.append(value)
+
+    @Command(Argument('outfile', type=argparse.FileType('w')))
+    async def write(outfile):
+        with outfile:
+            outfile.write('written')
+
+    @Command(Argument('items', nargs='+'))
+    async def extend(items):
+        items.append('mutated')
+        results.append(items)
+
+    cli = Cli(
+        (add.command.command_name, add.command, add),
+        (write.command.command_name, write.command, write),
+        (extend.command.command_name, extend.command, extend),
+        events=EventDispatcher(),
+        cache_parses=True,
+    )
+    parses = []
+    parse_args = cli.parser.parse_args
+
+    def counted(args=None, namespace=None):
+        parses.append(args)
+        return parse_args(args=args, namespace=namespace)
+
+    cli.parser.parse_args = counted
+
+    await cli.run('add 1')
+    await cli.run(['add', '1'])
+    await cli.run('add 2')
+
+    assert results == [1, 1, 2]
+    assert len(parses) == 2
+
+    monkeypatch.setattr(sys, 'argv', ['prog', 'add', '3'])
+    await cli.run()
+    monkeypatch.setattr(sys, 'argv', ['prog', 'add', '4'])
+    await cli.run()
+    assert results[-2:] == [3, 4]
+    assert len(parses) == 4
+
+    outfile = str(tmp_path / 'out.txt')
+    await cli.run(['write', outfile])
+    await cli.run(['write', outfile])
+    assert len(parses) == 6
+
+    await cli.run('extend a b')
+    await cli.run('extend a b')
+    assert results[-2:] == [['a', 'b', 'mutated'], ['a', 'b', 'mutated']]
+    assert len(parses) == 7
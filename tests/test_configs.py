@@ -8,6 +8,7 @@ from ruamel import yaml
 from precept import (
     Precept, Command, Argument, Config, ConfigProperty, Nestable, ConfigFormat,
     config_factory)
+from precept._configs import _loaded_files, _loaded_files_max
 
 override_configs = {
     'config_int': 25,
@@ -293,6 +294,14 @@ def test_config_environ(monkeypatch, name, value):
     assert getattr(cfg, name) == value
 
 
+@pytest.mark.parametrize('value', ['[1, 2, "a"]', '- 1\n- 2\n- a\n'])
+def test_config_environ_list(monkeypatch, value):
+    monkeypatch.setenv('CONFIG_LIST', value)
+    cfg = ConfigTest()
+
+    assert cfg.config_list == [1, 2, 'a']
+
+
 # pylint: disable=no-member
 def test_config_factory():
     d = {'flat': 'face', 'nested': {'double': {'keyed': 'alright'}}}
@@ -323,6 +332,12 @@ def test_config_get_root():
     root = c.get_root()
     assert root is c
 
+    double = c.config_nested.double_nested
+    assert double.get_root('double') == (
+        c, ('config_nested', 'double_nested', 'double')
+    )
+    assert double.get_root() == (c, ('config_nested', 'double_nested'))
+
 
 def test_config_auto_global():
     class Cfg(ConfigCli):
@@ -463,3 +478,76 @@ def test_toml_list():
     conf.config_format = ConfigFormat.TOML
     conf.read_file(config_file)
     assert conf.nest_list[0]['foo'] == 'foo'
+
+
+def test_read_file_cached(tmp_path, monkeypatch):
+    config_file = str(tmp_path / 'config.yml')
+    conf = ConfigTest(config_format=ConfigFormat.YML)
+    conf.save(config_file)
+
+    loads = []
+    serializer = type(conf._serializer)
+    original_load = serializer.load
+
+    def load(self, path):
+        loads.append(path)
+        return original_load(self, path)
+
+    monkeypatch.setattr(serializer, 'load', load)
+
+    conf.read_file(config_file)
+    conf._data['config_list'].append(4)
+    ConfigTest(config_format=ConfigFormat.YML).read_file(config_file)
+    assert len(loads) == 1
+
+    other = ConfigTest(config_format=ConfigFormat.YML)
+    other.read_file(config_file)
+    assert other.config_list == [1, 2, 3]
+
+    other.config_int = 99
+    other.save(config_file)
+    other.read_file(config_file)
+    assert len(loads) == 2
+    assert other.config_int == 99
+
+    Config.clear_file_cache()
+    other.read_file(config_file)
+    assert len(loads) == 3
+
+
+def test_read_file_cache_bounded(tmp_path):
+    Config.clear_file_cache()
+    conf = ConfigTest(config_format=ConfigFormat.JSON)
+    for i in range(_loaded_files_max + 5):
+        config_file = str(tmp_path / f'config{i}.json')
+        conf.save(config_file)
+        conf.read_file(config_file)
+
+    assert len(_loaded_files) == _loaded_files_max
+    Config.clear_file_cache()
+    assert not _loaded_files
+
+
+@pytest.mark.parametrize('config_format', list(ConfigFormat))
+def test_save_unchanged(tmp_path, config_format):
+    config_file = str(tmp_path / 'config')
+    conf = ConfigTest(config_format=config_format)
+    conf.save(config_file)
+    os.utime(config_file, ns=(0, 0))
+
+    conf.save(config_file)
+    assert os.stat(config_file).st_mtime_ns == 0
+
+    conf.config_int = 33
+    conf.save(config_file)
+    assert os.stat(config_file).st_mtime_ns != 0
+
+
+def test_save_over_binary(tmp_path):
+    config_file = tmp_path / 'config.toml'
+    config_file.write_bytes(b'\xff\xfe\x00binary')
+
+    conf = ConfigTest()
+    conf.save(str(config_file))
+
+    assert 'config_int' in config_file.read_text()
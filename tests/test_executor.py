@@ -1,6 +1,9 @@
+import asyncio
+
 import pytest
 
 from precept import AsyncExecutor
+from precept._executor import get_event_loop
 
 
 @pytest.mark.async_test
@@ -13,3 +16,67 @@ async def test_executor_wraps():
 
     three = await plus_one(2)
     assert three == 3
+
+
+@pytest.mark.async_test
+async def test_executor_kwargs():
+    executor = AsyncExecutor()
+
+    def join(*args, sep=' '):
+        return sep.join(args)
+
+    assert await executor.execute(join, 'a', 'b') == 'a b'
+    assert await executor.execute(join, 'a', 'b', sep='-') == 'a-b'
+
+
+@pytest.mark.async_test
+async def test_executor_many():
+    executor = AsyncExecutor()
+
+    results = await executor.execute_many(
+        pow, ((x, 2) for x in range(10)), chunksize=3
+    )
+    assert results == [x ** 2 for x in range(10)]
+    assert await executor.execute_many(pow, []) == []
+
+    with pytest.raises(ValueError, match='chunksize must be at least 1'):
+        await executor.execute_many(pow, [(1, 2)], chunksize=0)
+
+
+def test_executor_lazy_pool():
+    executor = AsyncExecutor()
+    assert executor._executor is None
+    pool = executor.executor
+    assert executor.executor is pool
+
+
+@pytest.mark.async_test
+async def test_executor_with_lock():
+    executor = AsyncExecutor()
+
+    def plus_one(num):
+        return num + 1
+
+    assert await executor.execute_with_lock(plus_one, 1) == 2
+    assert not executor.lock.locked()
+
+
+def test_executor_loop():
+    executor = AsyncExecutor()
+    assert executor.loop is get_event_loop()
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert AsyncExecutor(loop).loop is loop
+    finally:
+        loop.close()
+
+
+def test_get_event_loop():
+    loop = get_event_loop()
+    assert get_event_loop() is loop
+
+    async def running():
+        return get_event_loop()
+
+    assert loop.run_until_complete(running()) is loop
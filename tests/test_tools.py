@@ -0,0 +1,19 @@
+import pytest
+
+from precept._tools import snakecase, spinalcase
+
+
+@pytest.mark.parametrize(
+    'value, snake, spinal', [
+        ('', '', ''),
+        ('SimpleCli', 'simple_cli', 'simple-cli'),
+        ('log_result', 'log_result', 'log-result'),
+        ('log-file', 'log_file', 'log-file'),
+        ('config.nested', 'config_nested', 'config-nested'),
+        ('HTTPServer', 'h_t_t_p_server', 'h-t-t-p-server'),
+        ('foo bar', 'foo_bar', 'foo-bar'),
+    ]
+)
+def test_case_conversions(value, snake, spinal):
+    assert snakecase(value) == snake
+    assert spinalcase(value) == spinal